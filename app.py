@@ -16,6 +16,9 @@ from reportlab.pdfgen import canvas
 from reportlab.platypus.flowables import HRFlowable
 import io
 from PIL import Image as PILImage
+from desempenho import marcar_fase
+
+marcar_fase("inicializacao")
 
 # --- Conexão com Supabase ---
 SUPABASE_URL = st.secrets["supabase"]["url"]
@@ -438,6 +441,7 @@ if st.sidebar.button("Sair"):
     st.rerun()
 
 # --- Entrada do usuário ---
+marcar_fase("widgets_entrada")
 st.markdown("### Cotação de Planos de Saúde")
 qtd = st.number_input("Quantas pessoas serão incluídas?", min_value=1, max_value=10, step=1, value=1)
 
@@ -458,9 +462,11 @@ faixa_de_preco = st.slider(
 )
 
 # Carrega dados
+marcar_fase("carga_catalogo")
 df = pd.read_excel("planos_de_saude_unificado.xlsx", engine="openpyxl")
 
 # Filtros de Tipo
+marcar_fase("filtros")
 st.markdown("### Tipo de Plano")
 tipos_disponiveis = sorted(df["Tipo"].dropna().unique().tolist())
 cols_tipo = st.columns(len(tipos_disponiveis) if tipos_disponiveis else 1)
@@ -491,6 +497,7 @@ def idade_na_faixa(idade, faixa):
     return int(ini) <= idade <= int(fim)
 
 # Normaliza Validade
+marcar_fase("cotacao")
 val_raw = df["Validade"].astype(str).str.strip()
 df["_val_dt"] = pd.to_datetime(val_raw + "-01", errors="coerce")
 hoje_m = pd.to_datetime(datetime.now().strftime("%Y-%m") + "-01")
@@ -537,6 +544,7 @@ for chave, bloco in df_base.groupby(grupos):
 # Botão de cotação
 if st.button("Fazer cotação"):
     atualizar_sessao(st.session_state["username"])
+    marcar_fase("formatacao")
 
     if not resultados:
         st.warning("Nenhum plano atende a todas as idades informadas com os filtros atuais.")
@@ -585,6 +593,7 @@ if st.button("Fazer cotação"):
             df_vencidos = df_cot_fmt.loc[vencidos_mask]
 
             # Exibir planos válidos com botões de PDF
+            marcar_fase("exibicao")
             st.markdown("### ✅ Planos válidos")
             
             if not df_validos.empty:
@@ -620,11 +629,13 @@ if st.button("Fazer cotação"):
                                     plano_pdf_info[key] = value
                             
                             # Gerar PDF
+                            marcar_fase("pdf")
                             pdf_buffer = gerar_pdf_cotacao(
                                 plano_pdf_info, 
                                 idades,
                                 datetime.now().strftime("%d/%m/%Y")
                             )
+                            marcar_fase("exibicao")
                             
                             # Botão de download
                             nome_arquivo = f"cotacao_{row['Empresa'].replace(' ', '_')}_{row['Tipo'].replace(' ', '_')}.pdf"
@@ -671,4 +682,6 @@ if st.button("Fazer cotação"):
             
             ### 📄 Gerando PDFs
             Clique no botão **📄 PDF** ao lado de cada plano para baixar uma cotação detalhada em PDF.
-            """)
\ No newline at end of file
+            """)
+
+marcar_fase(None)
@@ -0,0 +1,414 @@
+"""
+Benchmark de ponta a ponta do app.py.
+
+Executa o script completo sem navegador (streamlit.testing), com st.secrets
+e Supabase simulados e valores de widgets roteirizados, medindo cada fase
+marcada com desempenho.marcar_fase(). Os resultados são comparados com uma
+linha de base em JSON e o processo termina com código 1 se alguma fase
+regredir além do limiar.
+
+Uso:
+    python benchmark.py                     # compara com benchmarks/baseline.json
+    python benchmark.py --salvar            # grava uma nova linha de base
+    python benchmark.py --limiar-tempo 0.5  # falha com tempos 50% maiores
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+import desempenho
+
+RAIZ = Path(__file__).resolve().parent
+APP = RAIZ / "app.py"
+CATALOGO = "planos_de_saude_unificado.xlsx"
+IMAGEM = "cotefacil.jpg"
+BASELINE_PADRAO = RAIZ / "benchmarks" / "baseline.json"
+
+# --- Cenários roteirizados ---
+CENARIOS = [
+    {
+        "nome": "uma_pessoa_sem_cotar",
+        "idades": [30],
+        "cotar": False,
+    },
+    {
+        "nome": "uma_pessoa",
+        "idades": [30],
+        "cotar": True,
+    },
+    {
+        "nome": "familia_quatro",
+        "idades": [42, 39, 12, 8],
+        "cotar": True,
+    },
+    {
+        "nome": "dez_pessoas",
+        "idades": [0, 5, 17, 22, 27, 35, 44, 51, 58, 70],
+        "cotar": True,
+    },
+    {
+        "nome": "filtros_restritos",
+        "idades": [65, 63],
+        "faixa_de_preco": (300.0, 2500.0),
+        "desmarcar_tipos": ["Ambulatorial"],
+        "desmarcar_empresas": ["Hapvida"],
+        "cotar": True,
+    },
+]
+
+# Regressão relativa tolerada por métrica. Entre execuções separadas na
+# mesma máquina, o mínimo dos tempos variou até ~1,8x sem mudança de código,
+# enquanto pico de memória e saldo de blocos ficaram dentro de ~2%; por isso
+# os tempos só falham acima do dobro da linha de base.
+LIMIAR_PADRAO = {
+    "tempo_parede_s": 1.0,
+    "tempo_cpu_s": 1.0,
+    "pico_memoria_bytes": 0.25,
+    "saldo_blocos": 0.25,
+}
+
+# Métricas determinísticas, comparadas por igualdade: quantas vezes cada
+# fase foi aberta (por exemplo, um bloco de exibição e um PDF por plano
+# válido). Qualquer diferença indica que o roteiro percorreu outro caminho.
+METRICAS_EXATAS = ("chamadas",)
+
+# Diferença absoluta mínima para contar como regressão, evitando que
+# fases muito curtas falhem por ruído mesmo acima do limiar relativo.
+TOLERANCIA_ABSOLUTA = {
+    "tempo_parede_s": 0.01,
+    "tempo_cpu_s": 0.01,
+    "pico_memoria_bytes": 64 * 1024,
+    "saldo_blocos": 500,
+}
+
+
+# --- Supabase simulado ---
+USUARIO = "benchmark"
+TOKEN = "benchmark"
+
+
+class _ConsultaFalsa:
+    """
+    Aceita qualquer encadeamento do query builder e sempre devolve o usuário
+    do benchmark com sessão ativa, para que checar_sessao_unica() passe
+    """
+
+    def __init__(self):
+        self._unico = False
+
+    def single(self):
+        self._unico = True
+        return self
+
+    def __getattr__(self, nome):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        linha = {"username": USUARIO, "sessao_ativa": True, "sessao_token": TOKEN}
+        return types.SimpleNamespace(data=linha if self._unico else [linha])
+
+
+class _ClienteFalso:
+    def table(self, nome):
+        return _ConsultaFalsa()
+
+
+def instalar_supabase_falso():
+    modulo = types.ModuleType("supabase")
+    modulo.create_client = lambda url, key: _ClienteFalso()
+    sys.modules["supabase"] = modulo
+
+
+def silenciar_streamlit():
+    """
+    O AppTest roda o script fora de um servidor e o streamlit avisa
+    "missing ScriptRunContext" várias vezes por execução. O nível também vai
+    para a configuração, que o streamlit reaplica ao carregá-la
+    """
+    from streamlit import config
+    from streamlit.logger import set_log_level
+
+    config.set_option("logger.level", "error")
+    set_log_level("error")
+
+
+def deslocar_validades(validades, hoje):
+    """
+    Desloca as validades ("AAAA-MM") pelo mesmo número de meses, de forma
+    que a mais antiga passe a ser o mês anterior a `hoje`
+    """
+    meses = [int(ano) * 12 + int(mes) - 1 for ano, mes in (str(v).strip().split("-") for v in validades)]
+    deslocamento = (hoje.year * 12 + hoje.month - 2) - min(meses)
+    return [f"{(m + deslocamento) // 12}-{(m + deslocamento) % 12 + 1:02d}" for m in meses]
+
+
+def preparar_diretorio(destino, hoje=None):
+    """
+    Copia os arquivos lidos pelo app para `destino`, deslocando as validades
+    do catálogo para que a mais antiga vença no mês anterior ao atual. Assim a
+    proporção de planos válidos e vencidos não depende da data de execução.
+    """
+    shutil.copy(RAIZ / IMAGEM, destino / IMAGEM)
+
+    df = pd.read_excel(RAIZ / CATALOGO, engine="openpyxl")
+    df["Validade"] = deslocar_validades(df["Validade"], hoje or datetime.now())
+    df.to_excel(destino / CATALOGO, index=False, engine="openpyxl")
+
+
+# --- Execução ---
+def _novo_app_test(timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP), default_timeout=timeout)
+    at.secrets["supabase"] = {"url": "http://supabase.invalid", "key": "benchmark"}
+    at.session_state["logged_in"] = True
+    at.session_state["username"] = USUARIO
+    at.session_state["sessao_token"] = TOKEN
+    return at
+
+
+def _verificar(at, cenario):
+    if at.exception:
+        raise RuntimeError(f"{cenario['nome']}: {at.exception[0].message}")
+
+
+def executar_cenario(cenario, medir_memoria, timeout):
+    """
+    Prepara os widgets do cenário e mede apenas a execução final do script
+    """
+    at = _novo_app_test(timeout)
+    at.run()
+    _verificar(at, cenario)
+
+    idades = cenario["idades"]
+    at.number_input[0].set_value(len(idades)).run()
+    _verificar(at, cenario)
+
+    for i, idade in enumerate(idades):
+        at.number_input(key=f"idade_{i}").set_value(idade)
+    at.slider[0].set_value(cenario.get("faixa_de_preco", (100.0, 4000.0)))
+    desmarcar = set(cenario.get("desmarcar_tipos", [])) | set(cenario.get("desmarcar_empresas", []))
+    for caixa in at.checkbox:
+        if caixa.label in desmarcar:
+            caixa.uncheck()
+
+    if cenario["cotar"]:
+        botao = next(b for b in at.button if b.label == "Fazer cotação")
+        botao.click()
+
+    coletor = desempenho.ColetorFases(medir_memoria=medir_memoria)
+    if medir_memoria:
+        # Sem coletas automáticas no meio da execução, o saldo de blocos
+        # não depende de quando o gc resolve rodar
+        gc.collect()
+        gc.disable()
+    desempenho.ativar(coletor)
+    inicio_parede = time.perf_counter()
+    inicio_cpu = time.process_time()
+    try:
+        at.run()
+    finally:
+        desempenho.desativar()
+        gc.enable()
+    total = {
+        "tempo_parede_s": time.perf_counter() - inicio_parede,
+        "tempo_cpu_s": time.process_time() - inicio_cpu,
+    }
+    _verificar(at, cenario)
+
+    fases = coletor.fases
+    fases["total"] = total
+    return fases
+
+
+def _minimos(execucoes):
+    resultado = {}
+    for execucao in execucoes:
+        for fase, metricas in execucao.items():
+            atual = resultado.setdefault(fase, {})
+            for metrica in ("tempo_parede_s", "tempo_cpu_s"):
+                atual[metrica] = min(atual.get(metrica, metricas[metrica]), metricas[metrica])
+            if "chamadas" in metricas:
+                atual["chamadas"] = max(atual.get("chamadas", 0), metricas["chamadas"])
+    return resultado
+
+
+def medir(cenarios, repeticoes, timeout):
+    """
+    Tempos são o mínimo de `repeticoes` execuções sem tracemalloc, o valor
+    menos afetado por interferência de outros processos. As repetições se
+    alternam entre os cenários para que um período lento da máquina não
+    caia inteiro sobre um só cenário. O número de chamadas de cada fase
+    é o mesmo em todas as execuções. Pico de memória e saldo de blocos vêm
+    de uma execução extra por cenário com tracemalloc ligado. Uma primeira
+    execução descartada de cada cenário aquece imports e caches
+    """
+    for cenario in cenarios:
+        executar_cenario(cenario, False, timeout)
+
+    execucoes = {cenario["nome"]: [] for cenario in cenarios}
+    for _ in range(repeticoes):
+        for cenario in cenarios:
+            execucoes[cenario["nome"]].append(executar_cenario(cenario, False, timeout))
+
+    resultados = {}
+    for cenario in cenarios:
+        resultado = _minimos(execucoes[cenario["nome"]])
+        tracemalloc.start()
+        try:
+            memoria = executar_cenario(cenario, True, timeout)
+        finally:
+            tracemalloc.stop()
+        for fase, metricas in memoria.items():
+            for metrica in ("pico_memoria_bytes", "saldo_blocos"):
+                if metrica in metricas:
+                    resultado.setdefault(fase, {})[metrica] = metricas[metrica]
+        resultados[cenario["nome"]] = resultado
+    return resultados
+
+
+def comparar(atual, base, limiares=LIMIAR_PADRAO):
+    """
+    Devolve (regressoes, avisos). Métricas que regrediram (ou, para as
+    contagens exatas, que mudaram em qualquer direção) e fases ou
+    cenários da linha de base que não aparecem na execução atual são
+    regressões; fases e cenários novos, sem referência, são avisos
+    """
+    regressoes = []
+    avisos = []
+    for cenario in base:
+        if cenario not in atual:
+            regressoes.append(f"{cenario}: cenário ausente na execução atual")
+    for cenario, fases in atual.items():
+        if cenario not in base:
+            avisos.append(f"{cenario}: cenário sem linha de base")
+            continue
+        for fase in base[cenario]:
+            if fase not in fases:
+                regressoes.append(f"{cenario}/{fase}: fase ausente na execução atual")
+        for fase, metricas in fases.items():
+            referencia = base[cenario].get(fase)
+            if referencia is None:
+                avisos.append(f"{cenario}/{fase}: fase sem linha de base")
+                continue
+            for metrica, valor in metricas.items():
+                anterior = referencia.get(metrica)
+                if anterior is None:
+                    continue
+                if metrica in METRICAS_EXATAS:
+                    if valor != anterior:
+                        regressoes.append(f"{cenario}/{fase}/{metrica}: {anterior} -> {valor}")
+                    continue
+                # saldo_blocos pode ser negativo: a margem relativa usa o
+                # módulo da linha de base para continuar sendo uma folga
+                diferenca = valor - anterior
+                margem = max(abs(anterior) * limiares[metrica], TOLERANCIA_ABSOLUTA[metrica])
+                if diferenca > margem:
+                    variacao = f" ({diferenca / abs(anterior):+.0%})" if anterior else ""
+                    regressoes.append(f"{cenario}/{fase}/{metrica}: {anterior:.6g} -> {valor:.6g}{variacao}")
+    return regressoes, avisos
+
+
+def gravar_linha_de_base(caminho, documento, parcial=False):
+    """
+    Grava `documento` como linha de base. Com `parcial` (execução com
+    --cenario), só os cenários medidos substituem os da linha de base
+    existente; os demais são mantidos
+    """
+    if parcial and caminho.exists():
+        cenarios = json.loads(caminho.read_text(encoding="utf-8"))["cenarios"]
+        cenarios.update(documento["cenarios"])
+        documento = {**documento, "cenarios": cenarios}
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    caminho.write_text(json.dumps(documento, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de ponta a ponta do app.py")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PADRAO)
+    parser.add_argument("--salvar", action="store_true", help="grava os resultados como nova linha de base")
+    parser.add_argument("--saida", type=Path, help="grava os resultados desta execução neste arquivo JSON")
+    parser.add_argument(
+        "--limiar-tempo", type=float, default=LIMIAR_PADRAO["tempo_cpu_s"],
+        help="regressão relativa tolerada nos tempos (padrão: %(default)s)",
+    )
+    parser.add_argument(
+        "--limiar-memoria", type=float, default=LIMIAR_PADRAO["pico_memoria_bytes"],
+        help="regressão relativa tolerada em memória e blocos (padrão: %(default)s)",
+    )
+    parser.add_argument("--repeticoes", type=int, default=7)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--cenario", action="append", help="executa apenas os cenários indicados")
+    args = parser.parse_args(argv)
+
+    cenarios = [c for c in CENARIOS if not args.cenario or c["nome"] in args.cenario]
+    instalar_supabase_falso()
+    silenciar_streamlit()
+
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        preparar_diretorio(Path(tmp))
+        os.chdir(tmp)
+        try:
+            resultados = medir(cenarios, args.repeticoes, args.timeout)
+        finally:
+            os.chdir(diretorio_original)
+
+    for nome, fases in resultados.items():
+        total = fases["total"]
+        print(f"{nome}: {total['tempo_parede_s']:.3f}s parede, {total['tempo_cpu_s']:.3f}s CPU")
+
+    documento = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "repeticoes": args.repeticoes,
+        "cenarios": resultados,
+    }
+    if args.saida:
+        args.saida.write_text(json.dumps(documento, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    if args.salvar:
+        gravar_linha_de_base(args.baseline, documento, parcial=bool(args.cenario))
+        print(f"Linha de base gravada em {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"Linha de base {args.baseline} não encontrada; rode com --salvar primeiro.")
+        return 1
+
+    base = json.loads(args.baseline.read_text(encoding="utf-8"))["cenarios"]
+    if args.cenario:
+        base = {nome: fases for nome, fases in base.items() if nome in args.cenario}
+    limiares = {
+        "tempo_parede_s": args.limiar_tempo,
+        "tempo_cpu_s": args.limiar_tempo,
+        "pico_memoria_bytes": args.limiar_memoria,
+        "saldo_blocos": args.limiar_memoria,
+    }
+    regressoes, avisos = comparar(resultados, base, limiares)
+    for mensagem in avisos:
+        print(f"Aviso: {mensagem}")
+    if regressoes:
+        print("Regressões em relação à linha de base:")
+        for mensagem in regressoes:
+            print(f"  {mensagem}")
+        return 1
+    print("Nenhuma regressão em relação à linha de base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
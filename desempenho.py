@@ -0,0 +1,83 @@
+import sys
+import time
+import tracemalloc
+
+# --- Medição de desempenho por fase ---
+# O app chama marcar_fase() em pontos fixos do script. Fora do benchmark
+# nenhum coletor está ativo e as chamadas não fazem nada.
+_coletor = None
+
+
+class ColetorFases:
+    """
+    Acumula tempo de parede, tempo de CPU e, opcionalmente, memória
+    por fase de uma execução do script, além de quantas vezes cada fase foi
+    aberta. Com medir_memoria, registra o pico do tracemalloc (que precisa
+    estar ativo) e o saldo de blocos vivos do interpretador
+    (sys.getallocatedblocks). O saldo é líquido, não uma contagem de
+    alocações: uma fase que aloca e libera muito fica perto de zero, e pode
+    ser negativo quando a fase libera mais do que aloca
+    """
+
+    def __init__(self, medir_memoria=False):
+        self.medir_memoria = medir_memoria
+        self.fases = {}
+        self._atual = None
+        self._inicio = None
+
+    def _abrir(self, nome):
+        self._atual = nome
+        self._inicio = {
+            "parede": time.perf_counter(),
+            "cpu": time.process_time(),
+        }
+        if self.medir_memoria:
+            tracemalloc.reset_peak()
+            self._inicio["memoria"] = tracemalloc.get_traced_memory()[0]
+            self._inicio["blocos"] = sys.getallocatedblocks()
+
+    def _fechar(self):
+        if self._atual is None:
+            return
+        fim_parede = time.perf_counter()
+        fim_cpu = time.process_time()
+        fase = self.fases.setdefault(self._atual, {
+            "tempo_parede_s": 0.0,
+            "tempo_cpu_s": 0.0,
+            "chamadas": 0,
+        })
+        fase["tempo_parede_s"] += fim_parede - self._inicio["parede"]
+        fase["tempo_cpu_s"] += fim_cpu - self._inicio["cpu"]
+        fase["chamadas"] += 1
+        if self.medir_memoria:
+            pico = tracemalloc.get_traced_memory()[1] - self._inicio["memoria"]
+            blocos = sys.getallocatedblocks() - self._inicio["blocos"]
+            fase["pico_memoria_bytes"] = max(fase.get("pico_memoria_bytes", 0), pico)
+            fase["saldo_blocos"] = fase.get("saldo_blocos", 0) + blocos
+        self._atual = None
+        self._inicio = None
+
+    def marcar(self, nome):
+        self._fechar()
+        if nome is not None:
+            self._abrir(nome)
+
+
+def ativar(coletor):
+    global _coletor
+    _coletor = coletor
+
+
+def desativar():
+    global _coletor
+    if _coletor is not None:
+        _coletor.marcar(None)
+    _coletor = None
+
+
+def marcar_fase(nome):
+    """
+    Encerra a fase corrente e inicia a fase `nome` (None apenas encerra)
+    """
+    if _coletor is not None:
+        _coletor.marcar(nome)
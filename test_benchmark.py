@@ -0,0 +1,152 @@
+import json
+from datetime import datetime
+
+import pandas as pd
+
+import benchmark
+
+LIMIARES = {
+    "tempo_parede_s": 0.5,
+    "tempo_cpu_s": 0.5,
+    "pico_memoria_bytes": 0.25,
+    "saldo_blocos": 0.25,
+}
+
+
+def _comparar(anterior, valor, metrica="saldo_blocos"):
+    base = {"c": {"pdf": {metrica: anterior}}}
+    atual = {"c": {"pdf": {metrica: valor}}}
+    return benchmark.comparar(atual, base, LIMIARES)
+
+
+def test_comparar_exige_limiar_relativo_e_piso_absoluto():
+    # 0.2 -> 0.29: abaixo de 50%
+    assert _comparar(0.2, 0.29, "tempo_cpu_s") == ([], [])
+    # 0.004 -> 0.012: +200%, mas abaixo do piso de 10 ms
+    assert _comparar(0.004, 0.012, "tempo_cpu_s") == ([], [])
+
+    regressoes, avisos = _comparar(0.2, 0.31, "tempo_cpu_s")
+    assert regressoes == ["c/pdf/tempo_cpu_s: 0.2 -> 0.31 (+55%)"]
+    assert avisos == []
+
+
+def test_comparar_linha_de_base_negativa():
+    # margem de |-4000| * 25% = 1000 blocos
+    assert _comparar(-4000, -3100) == ([], [])
+
+    regressoes, _ = _comparar(-4000, -2900)
+    assert regressoes == ["c/pdf/saldo_blocos: -4000 -> -2900 (+28%)"]
+
+    # melhorias nunca são regressões
+    assert _comparar(-4000, -9000) == ([], [])
+
+
+def test_comparar_linha_de_base_zero_usa_piso():
+    assert _comparar(0, benchmark.TOLERANCIA_ABSOLUTA["saldo_blocos"]) == ([], [])
+
+    regressoes, _ = _comparar(0, benchmark.TOLERANCIA_ABSOLUTA["saldo_blocos"] + 1)
+    assert regressoes == ["c/pdf/saldo_blocos: 0 -> 501"]
+
+
+def test_comparar_fases_e_cenarios_ausentes_ou_novos():
+    base = {
+        "uma_pessoa": {"exibicao": {"tempo_cpu_s": 0.1}, "pdf": {"tempo_cpu_s": 0.1}},
+        "dez_pessoas": {"exibicao": {"tempo_cpu_s": 0.1}},
+    }
+    atual = {
+        "uma_pessoa": {"exibicao": {"tempo_cpu_s": 0.1}, "graficos": {"tempo_cpu_s": 0.1}},
+        "familia_quatro": {"exibicao": {"tempo_cpu_s": 0.1}},
+    }
+
+    regressoes, avisos = benchmark.comparar(atual, base, LIMIARES)
+
+    assert sorted(regressoes) == [
+        "dez_pessoas: cenário ausente na execução atual",
+        "uma_pessoa/pdf: fase ausente na execução atual",
+    ]
+    assert sorted(avisos) == [
+        "familia_quatro: cenário sem linha de base",
+        "uma_pessoa/graficos: fase sem linha de base",
+    ]
+
+
+def test_deslocar_validades_mais_antiga_vence_no_mes_anterior():
+    validades = ["2025-07", "2025-12", " 2026-04 ", "2025-07"]
+
+    assert benchmark.deslocar_validades(validades, datetime(2025, 10, 3)) == [
+        "2025-09", "2026-02", "2026-06", "2025-09",
+    ]
+
+
+def test_deslocar_validades_virada_de_ano():
+    validades = ["2025-07", "2025-12", "2026-04"]
+
+    # a mais antiga vira dezembro do ano anterior
+    assert benchmark.deslocar_validades(validades, datetime(2026, 1, 15)) == [
+        "2025-12", "2026-05", "2026-09",
+    ]
+    # deslocamento de mais de um ano
+    assert benchmark.deslocar_validades(validades, datetime(2027, 2, 1)) == [
+        "2027-01", "2027-06", "2027-10",
+    ]
+
+
+def test_preparar_diretorio_desloca_catalogo(tmp_path):
+    benchmark.preparar_diretorio(tmp_path, hoje=datetime(2026, 1, 15))
+
+    original = pd.read_excel(benchmark.RAIZ / benchmark.CATALOGO, engine="openpyxl")
+    copia = pd.read_excel(tmp_path / benchmark.CATALOGO, engine="openpyxl")
+
+    assert (tmp_path / benchmark.IMAGEM).exists()
+    assert len(copia) == len(original)
+    assert copia["Validade"].astype(str).min() == "2025-12"
+    assert copia.drop(columns="Validade").equals(original.drop(columns="Validade"))
+
+
+def test_gravar_linha_de_base_parcial_mantem_outros_cenarios(tmp_path):
+    caminho = tmp_path / "benchmarks" / "baseline.json"
+    benchmark.gravar_linha_de_base(caminho, {
+        "repeticoes": 7,
+        "cenarios": {"uma_pessoa": {"pdf": {"tempo_cpu_s": 0.1}}, "dez_pessoas": {"pdf": {"tempo_cpu_s": 0.3}}},
+    })
+
+    benchmark.gravar_linha_de_base(caminho, {
+        "repeticoes": 3,
+        "cenarios": {"uma_pessoa": {"pdf": {"tempo_cpu_s": 0.2}}},
+    }, parcial=True)
+
+    documento = json.loads(caminho.read_text(encoding="utf-8"))
+    assert documento["repeticoes"] == 3
+    assert documento["cenarios"] == {
+        "uma_pessoa": {"pdf": {"tempo_cpu_s": 0.2}},
+        "dez_pessoas": {"pdf": {"tempo_cpu_s": 0.3}},
+    }
+
+
+def test_gravar_linha_de_base_completa_substitui(tmp_path):
+    caminho = tmp_path / "baseline.json"
+    benchmark.gravar_linha_de_base(caminho, {"cenarios": {"uma_pessoa": {}, "dez_pessoas": {}}})
+
+    benchmark.gravar_linha_de_base(caminho, {"cenarios": {"uma_pessoa": {}}})
+
+    assert json.loads(caminho.read_text(encoding="utf-8"))["cenarios"] == {"uma_pessoa": {}}
+
+
+def test_comparar_chamadas_exige_igualdade():
+    assert _comparar(20, 20, "chamadas") == ([], [])
+
+    regressoes, _ = _comparar(20, 19, "chamadas")
+    assert regressoes == ["c/pdf/chamadas: 20 -> 19"]
+    regressoes, _ = _comparar(20, 21, "chamadas")
+    assert regressoes == ["c/pdf/chamadas: 20 -> 21"]
+
+
+def test_minimos_preserva_chamadas():
+    execucoes = [
+        {"pdf": {"tempo_parede_s": 0.3, "tempo_cpu_s": 0.2, "chamadas": 9}},
+        {"pdf": {"tempo_parede_s": 0.1, "tempo_cpu_s": 0.4, "chamadas": 9}},
+    ]
+
+    assert benchmark._minimos(execucoes) == {
+        "pdf": {"tempo_parede_s": 0.1, "tempo_cpu_s": 0.2, "chamadas": 9},
+    }
@@ -0,0 +1,79 @@
+import tracemalloc
+
+import pytest
+
+import desempenho
+
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = RelogioFalso()
+    monkeypatch.setattr(desempenho.time, "perf_counter", relogio)
+    monkeypatch.setattr(desempenho.time, "process_time", relogio)
+    return relogio
+
+
+def test_fase_reaberta_acumula_tempo_e_chamadas(relogio):
+    coletor = desempenho.ColetorFases()
+
+    # exibicao e pdf se alternam a cada plano do loop do app
+    for duracao_exibicao, duracao_pdf in [(1.0, 3.0), (2.0, 5.0)]:
+        coletor.marcar("exibicao")
+        relogio.agora += duracao_exibicao
+        coletor.marcar("pdf")
+        relogio.agora += duracao_pdf
+    coletor.marcar(None)
+
+    assert coletor.fases["exibicao"]["tempo_parede_s"] == pytest.approx(3.0)
+    assert coletor.fases["exibicao"]["tempo_cpu_s"] == pytest.approx(3.0)
+    assert coletor.fases["exibicao"]["chamadas"] == 2
+    assert coletor.fases["pdf"]["tempo_parede_s"] == pytest.approx(8.0)
+    assert coletor.fases["pdf"]["chamadas"] == 2
+
+
+def test_fase_reaberta_guarda_maior_pico_e_soma_blocos():
+    coletor = desempenho.ColetorFases(medir_memoria=True)
+    vivos = []
+
+    tracemalloc.start()
+    try:
+        for tamanho in (1_000_000, 3_000_000):
+            coletor.marcar("pdf")
+            temporario = bytearray(tamanho)
+            del temporario
+            vivos.append([object() for _ in range(5000)])
+            coletor.marcar("exibicao")
+        coletor.marcar(None)
+    finally:
+        tracemalloc.stop()
+
+    pdf = coletor.fases["pdf"]
+    assert 3_000_000 <= pdf["pico_memoria_bytes"] < 4_000_000
+    assert pdf["saldo_blocos"] >= 2 * 5000
+
+
+def test_marcar_fase_sem_coletor_nao_faz_nada():
+    desempenho.marcar_fase("cotacao")
+    desempenho.marcar_fase(None)
+
+
+def test_desativar_encerra_fase_corrente(relogio):
+    coletor = desempenho.ColetorFases()
+    desempenho.ativar(coletor)
+    try:
+        desempenho.marcar_fase("cotacao")
+        relogio.agora += 2.0
+    finally:
+        desempenho.desativar()
+
+    assert coletor.fases["cotacao"]["tempo_parede_s"] == pytest.approx(2.0)
+    desempenho.marcar_fase("formatacao")
+    assert "formatacao" not in coletor.fases